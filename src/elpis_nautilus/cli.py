@@ -5,22 +5,23 @@ Click-based unified command-line interface for Elpis Nautilus utilities.
 """
 from __future__ import annotations
 
+import functools
+import json
 import logging
+import os
 import re
+import tempfile
+import time
 from typing import Final, NamedTuple
 from datetime import datetime, date
 from calendar import month_name
 
 import click
-from tabulate import tabulate
-from bs4 import BeautifulSoup
-
-from elpis_nautilus.data_downloaders.downloader_main import (
-    HISTDATA_BASE,
-    _ensure_tmp_dir,
-    _session,
-    download_histdata
-)
+
+from elpis_nautilus.utils.config import settings
+
+# The downloader (requests, lxml), bs4 and tabulate are imported inside the
+# commands that need them, so `elpis --help` and completion start quickly.
 
 # Initialize logging for CLI
 logging.basicConfig(
@@ -59,8 +60,96 @@ _MONTH_MAP: Final[dict[str, int]] = {
     if m
 }
 
+# "(2000/May)"-style first-available-month marker next to each instrument
+_START_RE: Final = re.compile(r"\((\d{4})/(\w+)\)")
+
+# Symbol label inside each tick-data link on the listing page
+_SYMBOL_SELECTOR: Final = 'a[href*="/ascii/tick-data-quotes/"] strong'
 
-def _histdata_info() -> list[InstrumentInfo]:
+# The instrument list changes at most monthly; re-scrape once a day.
+_HISTDATA_CACHE: Final = settings.cache_dir / "histdata_info.json"
+_HISTDATA_CACHE_TTL: Final = 24 * 60 * 60  # seconds
+
+
+def _load_histdata_cache() -> list[InstrumentInfo] | None:
+    """
+    Return the cached HistData instrument list, or None if the cache is
+    missing, older than _HISTDATA_CACHE_TTL or unreadable.
+    """
+    try:
+        age = time.time() - _HISTDATA_CACHE.stat().st_mtime
+        if age > _HISTDATA_CACHE_TTL:
+            return None
+        with _HISTDATA_CACHE.open(encoding="utf-8") as fh:
+            rows = json.load(fh)
+        return [
+            InstrumentInfo(row["symbol"],
+                           datetime.fromisoformat(row["date_from"]),
+                           datetime.fromisoformat(row["date_to"]),
+                           row["interval"])
+            for row in rows
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_histdata_cache(infos: list[InstrumentInfo]) -> None:
+    """Atomically write *infos* to the cache file (temp file + rename)."""
+    rows = [
+        {"symbol": inf.symbol,
+         "date_from": inf.date_from.isoformat(),
+         "date_to": inf.date_to.isoformat(),
+         "interval": inf.interval}
+        for inf in infos
+    ]
+    try:
+        _HISTDATA_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8",
+                                         dir=_HISTDATA_CACHE.parent,
+                                         suffix=".tmp",
+                                         delete=False) as fh:
+            json.dump(rows, fh)
+        os.replace(fh.name, _HISTDATA_CACHE)
+    except OSError as exc:
+        LOGGER.warning("Could not write cache %s – %s", _HISTDATA_CACHE, exc)
+
+
+def _histdata_info(refresh: bool = False) -> list[InstrumentInfo]:
+    """
+    Return all available HistData.com tick-data instruments, served from
+    memory or the on-disk cache when it is fresh.
+
+    Args:
+        refresh (bool): Ignore both caches and scrape HistData.com again.
+
+    Returns:
+        List[InstrumentInfo]: one entry per symbol with (symbol, date_from,
+        date_to, "tick").
+    """
+    if refresh:
+        _cached_histdata_info.cache_clear()
+        return _rescrape_histdata_info()
+    return list(_cached_histdata_info())
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_histdata_info() -> tuple[InstrumentInfo, ...]:
+    """Disk cache or a fresh scrape, memoised for the life of the process."""
+    cached = _load_histdata_cache()
+    if cached is None:
+        cached = _rescrape_histdata_info()
+    return tuple(cached)
+
+
+def _rescrape_histdata_info() -> list[InstrumentInfo]:
+    """Scrape HistData.com and store non-empty results on disk."""
+    infos = _scrape_histdata_info()
+    if infos:
+        _store_histdata_cache(infos)
+    return infos
+
+
+def _scrape_histdata_info() -> list[InstrumentInfo]:
     """
     Scrape HistData.com for all available tick‐data instruments and
     their date ranges.
@@ -69,23 +158,32 @@ def _histdata_info() -> list[InstrumentInfo]:
         List[InstrumentInfo]: one entry per symbol with (symbol, date_from,
         date_to, "tick").
     """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    from elpis_nautilus.data_downloaders.downloader_main import (
+        HISTDATA_BASE,
+        _session,
+    )
+
     resp = _session().get(f"{HISTDATA_BASE}/?/ascii/tick-data-quotes/",
                           timeout=20)
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    # Only the <td> cells carry instrument links; skip building the rest.
+    soup = BeautifulSoup(resp.text, "lxml", parse_only=SoupStrainer("td"))
 
-    infos: list[InstrumentInfo] = []
-    for td in soup.find_all("td"):
-        link = next(
-            (a for a in td.find_all("a", href=True)
-             if "/ascii/tick-data-quotes/" in a["href"]),
-            None
-        )
-        if not link or not (strong := link.find("strong")):
-            continue
+    # The end month is the same for every instrument; compute it once.
+    today = date.today()
+    date_to = datetime(
+        today.year - (today.month == 1),
+        (today.month - 2) % 12 + 1,
+        1
+    )
 
+    infos: list[InstrumentInfo] = []
+    for strong in soup.select(_SYMBOL_SELECTOR):
+        td = strong.find_parent("td")
         symbol = strong.text.replace("/", "").strip().upper()
-        m = re.search(r"\((\d{4})/(\w+)\)", td.get_text(" "))
+        m = _START_RE.search(td.get_text(" "))
         if not m:
             LOGGER.warning("No start date for %s", symbol)
             continue
@@ -97,13 +195,6 @@ def _histdata_info() -> list[InstrumentInfo]:
             continue
 
         date_from = datetime(year, month, 1)
-        today = date.today()
-        date_to = datetime(
-            today.year - (today.month == 1),
-            (today.month - 2) % 12 + 1,
-            1
-        )
-
         infos.append(InstrumentInfo(symbol, date_from, date_to, "tick"))
 
     return infos
@@ -139,16 +230,24 @@ def download() -> None:
     callback=lambda _ctx, _param, val: datetime.strptime(val, "%Y-%m"),
     help="End YYYY-MM",
 )
-def histdata_cmd(symbol: str, date_from: datetime, date_to: datetime) -> None:
+@click.option("--force", is_flag=True,
+              help="Re-download months completed by an earlier run.")
+def histdata_cmd(symbol: str, date_from: datetime, date_to: datetime,
+                 force: bool) -> None:
     """Download tick data for a given symbol and
     date range from HistData.com."""
+    from elpis_nautilus.data_downloaders.downloader_main import (
+        _ensure_tmp_dir,
+        download_histdata,
+    )
+
     if date_to < date_from:
         raise click.BadParameter("'--to' must be >= '--from'")
     tmp = _ensure_tmp_dir()
     if not click.confirm(f"Proceed with {symbol.upper()}?", default=True):
         click.echo("Aborted.")
         return
-    download_histdata(symbol.upper(), date_from, date_to, tmp)
+    download_histdata(symbol.upper(), date_from, date_to, tmp, force=force)
     click.echo(f"Done – files in {tmp}")
 
 
@@ -160,11 +259,15 @@ def show_available() -> None:
 
 @show_available.command("histdata",
                         help="Show available ticks from HistData.com")
-def show_histdata() -> None:
+@click.option("--refresh", is_flag=True,
+              help="Ignore the cached instrument list and re-scrape.")
+def show_histdata(refresh: bool) -> None:
     """Fetch and display all instruments with available
     tick-data ranges from HistData.com."""
+    from tabulate import tabulate
+
     click.echo("Fetching metadata from HistData.com…", err=True)
-    infos = _histdata_info()
+    infos = _histdata_info(refresh=refresh)
     if not infos:
         click.echo("No instruments found.", err=True)
         raise SystemExit(1)
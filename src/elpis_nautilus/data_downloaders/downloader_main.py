@@ -9,19 +9,38 @@ Changelog
   module is imported and download_histdata() is called programmatically (no
   CLI). The helper attaches a StreamHandler to logger if none exist and sets
   the level from settings.log_level.
+* **2026‑10‑15** – download_histdata() fetches months concurrently on a
+  thread pool of DOWNLOAD_WORKERS threads sharing one requests.Session;
+  finished ZIPs are extracted on a separate pool while downloads continue.
+  Completed months leave a .done-<SYMBOL>-<YYYY>-<MM> marker listing their
+  CSVs in dest and are skipped on later runs while those files exist.
+  Requests go through _send(), which caps requests in flight at
+  MAX_IN_FLIGHT and backs off on HTTP 429.
 """
 from __future__ import annotations
 
+import contextlib
 import logging
+import math
+import os
+import random
 import re
+import shutil
 import sys
+import threading
+import time
+import types
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
 
+import lxml.etree
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+import urllib3.exceptions
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urljoin
 
 # ---------------------------------------------------------------------------
@@ -54,18 +73,50 @@ def _ensure_logger() -> None:
 
 _ensure_logger()
 
-HEADERS = {
+# Read-only. _session() copies it into the shared session once, when it
+# builds that session under _SESSION_LOCK; nothing mutates it per call.
+HEADERS = types.MappingProxyType({
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36",
     "Accept":
         "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-}
+    "Connection": "keep-alive",
+})
 
 ###############################################################################
 # Constants for HistData.com
 ###############################################################################
 HISTDATA_BASE = "https://www.histdata.com/download-free-forex-historical-data"
 
+# Quotes are matched by the pattern itself, so no post-processing is needed
+_FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+# Keep-alive pool shared by all workers, retrying transient server errors
+# with exponential backoff. 429 is left to _send() (see below).
+POOL_SIZE = 16
+RETRY_POLICY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+)
+
+# Process-wide cap on requests in flight to HistData (MAX_IN_FLIGHT env
+# var), plus backoff when the server answers 429 Too Many Requests.
+MAX_IN_FLIGHT = min(POOL_SIZE, max(1, settings.max_in_flight))
+RATE_LIMIT_ATTEMPTS = 5
+MAX_BACKOFF = 60.0  # seconds
+_REQUEST_SLOTS = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+# Months are independent, so several are fetched at once. Kept small by
+# default (DOWNLOAD_WORKERS env var) to stay polite towards a free provider.
+# A download holds its request slot for the whole transfer, so workers
+# beyond MAX_IN_FLIGHT would only wait; raise both together.
+DOWNLOAD_WORKERS = min(MAX_IN_FLIGHT, max(1, settings.download_workers))
+# Extraction runs on its own pool so unzipping overlaps the next downloads.
+# zlib releases the GIL while inflating, so threads scale across cores.
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+
 ###############################################################################
 # Helper functions
 ###############################################################################
@@ -86,12 +137,11 @@ def _ensure_tmp_dir() -> Path:
 
 
 def _year_month_range(start: datetime,
-                      end: datetime) -> Iterable[tuple[int, int]]:
-    cur = datetime(start.year, start.month, 1)
-    end_marker = datetime(end.year, end.month, 1)
-    while cur <= end_marker:
-        yield cur.year, cur.month
-        cur = datetime(cur.year + (cur.month // 12), (cur.month % 12) + 1, 1)
+                      end: datetime) -> list[tuple[int, int]]:
+    # Count months from year 0 so the range is a plain integer range.
+    first = 12 * start.year + start.month - 1
+    last = 12 * end.year + end.month - 1
+    return [(n // 12, n % 12 + 1) for n in range(first, last + 1)]
 
 ###############################################################################
 # HistData workflow
@@ -100,35 +150,103 @@ def _year_month_range(start: datetime,
 
 
 _SESSION = None  # type: requests.Session | None
+_SESSION_LOCK = threading.Lock()
 
 
 def _session() -> requests.Session:
     """
-    Lazily initialise and return a requests.Session with default headers.
-    Subsequent calls return the same session.
+    Lazily initialise and return a requests.Session with default headers,
+    a POOL_SIZE connection pool and RETRY_POLICY mounted for http(s).
+    Subsequent calls return the same session; creation is locked because
+    the download workers may all ask for it at once.
     """
     global _SESSION
     if _SESSION is None:
-        _SESSION = requests.Session()
-        _SESSION.headers.update(HEADERS)
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                sess = requests.Session()
+                sess.headers.update(HEADERS)
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE,
+                                      pool_maxsize=POOL_SIZE,
+                                      max_retries=RETRY_POLICY)
+                sess.mount("https://", adapter)
+                sess.mount("http://", adapter)
+                # publish only once fully configured
+                _SESSION = sess
     return _SESSION
 
 
 def _histdata_page(symbol: str, year: int, month: int) -> str:
-    return (
-        f"{HISTDATA_BASE}"
-        f"?/ascii/tick-data-quotes/"
-        f"{symbol.lower()}/"
-        f"{year}/"
-        f"{month}"
-    )
+    return (f"{HISTDATA_BASE}?/ascii/tick-data-quotes/"
+            f"{symbol.lower()}/{year}/{month}")
 
 
 def _extract_filename(content_disposition: str) -> str | None:
-    match = re.search(r"filename=([^;]+)", content_disposition)
-    if match:
-        return match.group(1).strip().strip("\"")
-    return None
+    match = _FILENAME_RE.search(content_disposition)
+    return match.group(1).strip() if match else None
+
+
+_PARSERS = threading.local()
+
+
+def _html_parser() -> lxml.html.HTMLParser:
+    """This thread's reusable lxml parser (parsers are not thread-safe)."""
+    parser = getattr(_PARSERS, "parser", None)
+    if parser is None:
+        parser = _PARSERS.parser = lxml.html.HTMLParser()
+    return parser
+
+
+def _parse_page(html: bytes) -> lxml.html.HtmlElement | None:
+    """
+    Parse a listing page with lxml; return None for an empty document.
+    Raw bytes let lxml honour <meta charset> and any XML prolog.
+    """
+    try:
+        return lxml.html.fromstring(html, parser=_html_parser())
+    except lxml.etree.ParserError:
+        return None
+
+
+def _retry_after(resp: requests.Response) -> float | None:
+    """
+    Seconds requested by a Retry-After header, if it holds a usable
+    number; negative, NaN and infinite values are ignored.
+    """
+    try:
+        delay = float(resp.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+    if not math.isfinite(delay) or delay < 0:
+        return None
+    return min(delay, MAX_BACKOFF)
+
+
+def _send(call, url: str, *, slot_held: bool = False,
+          **kwargs) -> requests.Response:
+    """
+    Run ``call(url, **kwargs)`` (a session's get/post) while holding one of
+    MAX_IN_FLIGHT request slots. On HTTP 429 wait for Retry-After, or a
+    jittered exponential delay, and try again up to RATE_LIMIT_ATTEMPTS
+    times; the last response is returned whatever its status.
+
+    Pass *slot_held* when the caller already owns a slot, as streamed
+    downloads do until their body has been read.
+    """
+    slot = contextlib.nullcontext() if slot_held else _REQUEST_SLOTS
+    for attempt in range(1, RATE_LIMIT_ATTEMPTS + 1):
+        with slot:
+            resp = call(url, **kwargs)
+        if resp.status_code != 429 or attempt == RATE_LIMIT_ATTEMPTS:
+            return resp
+        resp.close()
+        delay = _retry_after(resp)
+        if delay is None:
+            delay = min(MAX_BACKOFF, 2 ** attempt) + random.random()
+        logger.warning("Rate limited on %s – retrying in %.1f s (%d/%d)",
+                       url, delay, attempt, RATE_LIMIT_ATTEMPTS - 1)
+        time.sleep(delay)
+    return resp
 
 
 def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
@@ -136,22 +254,28 @@ def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
     sess = _session()
     page_url = _histdata_page(symbol, year, month)
     try:
-        page = sess.get(page_url, timeout=20)
+        page = _send(sess.get, page_url, timeout=20)
         page.raise_for_status()
     except requests.RequestException as exc:
         logger.error("Listing page failed %s – %s", page_url, exc)
         return None
 
-    soup = BeautifulSoup(page.text, "html.parser")
+    # Only two elements matter on the page, so look them up directly on
+    # the lxml tree rather than building a BeautifulSoup object model.
+    root = _parse_page(page.content)
+    if root is None:
+        logger.error("Empty listing page %s", page_url)
+        return None
 
     # 1) Try the standard form-based download
-    form = soup.find("form", id="file_down")
-    if form:
+    form = root.get_element_by_id("file_down", None)
+    if form is not None:
         payload = {
-            inp["name"]: inp.get("value", "")
-            for inp in form.find_all("input", attrs={"name": True})
+            inp.get("name"): inp.get("value", "")
+            for inp in form.iterfind(".//input[@name]")
         }
         form_action = urljoin(page_url, form.get("action", "get.php"))
+        zip_name = payload.get("file", "")
         downloader = sess.post
         dl_args = {
             "data": payload,
@@ -160,11 +284,11 @@ def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
         }
     # 2) Fallback: grab the hidden <a id="a_file"> link and POST its filename
     else:
-        link = soup.find("a", id="a_file")
-        if not link or not link.text.strip().lower().endswith(".zip"):
+        link = root.get_element_by_id("a_file", None)
+        zip_name = "" if link is None else link.text_content().strip()
+        if not zip_name.lower().endswith(".zip"):
             logger.error("No download form or ZIP link found on %s", page_url)
             return None
-        zip_name = link.text.strip()
         form_action = urljoin(page_url, "get.php")
         downloader = sess.post
         dl_args = {
@@ -173,9 +297,19 @@ def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
             "stream": True,
         }
 
-    # perform the actual download
+    # A streamed download keeps its request slot until the whole body is
+    # on disk, so MAX_IN_FLIGHT bounds the actual transfers.
+    with _REQUEST_SLOTS:
+        return _download_zip(downloader, form_action, dl_args, zip_name,
+                             symbol, year, month, dest)
+
+
+def _download_zip(downloader, url: str, dl_args: dict, zip_name: str,
+                  symbol: str, year: int, month: int,
+                  dest: Path) -> Path | None:
+    """POST for one month's ZIP and stream it into *dest*."""
     try:
-        resp = downloader(form_action, **dl_args, timeout=60)
+        resp = _send(downloader, url, slot_held=True, **dl_args, timeout=60)
         resp.raise_for_status()
     except requests.RequestException as exc:
         logger.error("Download failed for %s %04d/%02d – %s",
@@ -196,10 +330,23 @@ def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
     # write out the file
     fname = _extract_filename(disp) or zip_name
     zip_path = dest / fname
-    with zip_path.open("wb") as fh:
-        for chunk in resp.iter_content(chunk_size=1 << 16):
-            if chunk:
-                fh.write(chunk)
+    # Copy straight from the raw stream in 1 MiB blocks; decode_content
+    # keeps any transfer Content-Encoding transparent as iter_content did.
+    # Write to a .part file first so an interrupted download never leaves
+    # a truncated ZIP under the final name.
+    part_path = zip_path.with_name(zip_path.name + ".part")
+    resp.raw.decode_content = True
+    try:
+        with part_path.open("wb") as fh:
+            shutil.copyfileobj(resp.raw, fh, length=1 << 20)
+        os.replace(part_path, zip_path)
+    except (urllib3.exceptions.HTTPError, requests.RequestException,
+            OSError) as exc:
+        # reading resp.raw raises urllib3 errors, not requests ones
+        part_path.unlink(missing_ok=True)
+        logger.error("Download interrupted for %s %04d/%02d – %s",
+                     symbol, year, month, exc)
+        return None
 
     size_bytes = zip_path.stat().st_size
     size_mb = size_bytes / (1024 * 1024)
@@ -207,32 +354,71 @@ def _fetch_zip(symbol: str, year: int, month: int, dest: Path) -> Path | None:
     return zip_path
 
 
-def _extract_zip(zip_path: Path, dest: Path) -> None:
+def _month_marker(dest: Path, symbol: str, year: int, month: int) -> Path:
+    """
+    Sentinel file recording that a month was downloaded and extracted; it
+    lists the data files the month produced, one name per line.
+    """
+    return dest / f".done-{symbol.upper()}-{year:04d}-{month:02d}"
+
+
+def _month_is_current(marker: Path) -> bool:
+    """
+    True if *marker* exists and every file it lists is still in place.
+
+    HistData months never change once published and the ZIPs come from a
+    POST without ETag/Last-Modified validators, so the local files are the
+    only thing that can go stale.
+    """
+    try:
+        names = marker.read_text(encoding="utf-8").split()
+    except OSError:
+        return False
+    return all((marker.parent / name).exists() for name in names)
+
+
+def _extract_zip(zip_path: Path, dest: Path) -> list[str] | None:
+    """
+    Extract the data files in *zip_path* into *dest* and return their
+    names, or None if the archive is bad. The .txt status file HistData
+    bundles with each month is never written out.
+    """
     try:
         with zipfile.ZipFile(zip_path) as zf:
-            zf.extractall(dest)
+            names = [n for n in zf.namelist() if not n.endswith(".txt")]
+            zf.extractall(dest, members=names)
     except zipfile.BadZipFile as exc:
         logger.error("Bad ZIP %s – %s", zip_path.name, exc)
         zip_path.unlink(missing_ok=True)
-        return
+        return None
     finally:
         # Always remove the ZIP itself
         zip_path.unlink(missing_ok=True)
+    return names
 
-    # Remove any .txt files in dest
-    for txt in dest.glob("*.txt"):
-        try:
-            txt.unlink()
-        except OSError as exc:
-            logger.warning("Could not delete %s – %s", txt.name, exc)
+
+def _extract_month(zip_path: Path, dest: Path, marker: Path) -> None:
+    """
+    Extract one month's ZIP and write its marker straight away, so an
+    interrupted run keeps every month finished before the interruption.
+    """
+    names = _extract_zip(zip_path, dest)
+    if names is not None:
+        marker.write_text("\n".join(names), encoding="utf-8")
 
 
 def download_histdata(symbol: str,
                       start: datetime,
                       end: datetime,
-                      dest: Path) -> None:
+                      dest: Path,
+                      force: bool = False) -> None:
     """Programmatic API: download HistData tick
-    ZIPs and leave CSVs in *dest*."""
+    ZIPs and leave CSVs in *dest*.
+
+    Months already completed by an earlier run (see _month_marker) are
+    skipped without touching the network, as long as their extracted
+    files are still present. Pass *force* to drop those markers and
+    download every month again."""
     logger.info(
         "Downloading %s %s → %s into %s",
         symbol,
@@ -240,8 +426,52 @@ def download_histdata(symbol: str,
         end.strftime("%Y-%m"),
         dest,
     )
-    for y, m in _year_month_range(start, end):
-        zip_path = _fetch_zip(symbol, y, m, dest)
-        if zip_path:
-            _extract_zip(zip_path, dest)
+    # Leftovers from an interrupted run are never complete; drop them.
+    # Only this symbol's (HISTDATA_COM_..._<SYMBOL>_T<YYYYMM>.zip.part), as
+    # a run for another symbol may be downloading into the same dest.
+    for part in dest.glob(f"*_{symbol.upper()}_*.part"):
+        part.unlink(missing_ok=True)
+    dl_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+    ex_pool = ThreadPoolExecutor(max_workers=EXTRACT_WORKERS)
+    try:
+        downloads = {}
+        for y, m in _year_month_range(start, end):
+            marker = _month_marker(dest, symbol, y, m)
+            if force:
+                marker.unlink(missing_ok=True)
+            elif _month_is_current(marker):
+                logger.info("Skipping %s %04d/%02d – already downloaded",
+                            symbol, y, m)
+                continue
+            downloads[dl_pool.submit(_fetch_zip, symbol, y, m, dest)] = (y, m)
+        # A failing month is logged and left unmarked; the others carry on.
+        extractions = {}
+        for done in as_completed(downloads):
+            y, m = downloads[done]
+            try:
+                zip_path = done.result()
+            except Exception as exc:
+                logger.error("Download failed for %s %04d/%02d – %s",
+                             symbol, y, m, exc)
+                continue
+            if zip_path:
+                job = ex_pool.submit(_extract_month, zip_path, dest,
+                                     _month_marker(dest, symbol, y, m))
+                extractions[job] = (y, m)
+        for job in as_completed(extractions):
+            y, m = extractions[job]
+            try:
+                job.result()
+            except Exception as exc:
+                logger.error("Extraction failed for %s %04d/%02d – %s",
+                             symbol, y, m, exc)
+    except BaseException:
+        # Ctrl-C or an unexpected error: drop the queued months rather than
+        # waiting for every one of them to download before exiting.
+        dl_pool.shutdown(wait=False, cancel_futures=True)
+        ex_pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    finally:
+        dl_pool.shutdown()
+        ex_pool.shutdown()
     logger.info("Completed %s", symbol)
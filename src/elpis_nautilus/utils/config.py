@@ -1,4 +1,5 @@
 import os
+from functools import cached_property
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -16,31 +17,45 @@ class Config:
     Simple config class that reads settings from environment variables.
     """
 
-    # --- Core data-dir paths -------------------------------------------------
-    data_dir_name: str = os.getenv("DATA_DIR", "data")
+    def __init__(self) -> None:
+        env = os.environ
 
-    @property
+        # --- Core data-dir paths ---------------------------------------------
+        self.data_dir_name: str = env.get("DATA_DIR", "data")
+
+        # --- Database -------------------------------------------------------
+        self.db_host: str = env.get("POSTGRES_HOST", "localhost")
+        self.db_port: int = int(env.get("POSTGRES_PORT", "5432"))
+        self.db_name: str = env.get("POSTGRES_DB", "elpis")
+        self.db_user: str = env.get("POSTGRES_USER", "polymerase")
+        self.db_password: str | None = env.get("POSTGRES_PASSWORD")
+
+        # --- API credentials ------------------------------------------------
+        self.account_key: str | None = env.get("ACCOUNT_KEY")
+        self.access_token: str | None = env.get("ACCESS_TOKEN")
+
+        # --- Logging & monitoring ------------------------------------------
+        self.log_level: str = env.get("LOG_LEVEL", "INFO")
+        self.prometheus_port: int = int(env.get("PROMETHEUS_PORT", "8000"))
+
+        # --- Downloads ------------------------------------------------------
+        # Concurrent requests to HistData; workers beyond this only wait,
+        # so the downloader caps download_workers at max_in_flight.
+        self.max_in_flight: int = int(env.get("MAX_IN_FLIGHT", "4"))
+        self.download_workers: int = int(env.get("DOWNLOAD_WORKERS", "4"))
+
+    # data_dir_name never changes after construction, so build each Path once.
+    @cached_property
     def data_dir(self) -> Path:
         return BASE_DIR / self.data_dir_name
 
-    @property
+    @cached_property
     def tmp_dir(self) -> Path:
         return self.data_dir / "tmp"
 
-    # --- Database -----------------------------------------------------------
-    db_host: str = os.getenv("POSTGRES_HOST", "localhost")
-    db_port: int = int(os.getenv("POSTGRES_PORT", 5432))
-    db_name: str = os.getenv("POSTGRES_DB", "elpis")
-    db_user: str = os.getenv("POSTGRES_USER", "polymerase")
-    db_password: str | None = os.getenv("POSTGRES_PASSWORD")
-
-    # --- API credentials ----------------------------------------------------
-    account_key: str | None = os.getenv("ACCOUNT_KEY")
-    access_token: str | None = os.getenv("ACCESS_TOKEN")
-
-    # --- Logging & monitoring ----------------------------------------------
-    log_level: str = os.getenv("LOG_LEVEL", "INFO")
-    prometheus_port: int = int(os.getenv("PROMETHEUS_PORT", 8000))
+    @cached_property
+    def cache_dir(self) -> Path:
+        return self.data_dir / "cache"
 
 
 # Shared singleton
@@ -6,6 +6,8 @@ Goal: ≥90 % coverage without touching the network or filesystem.
 
 from __future__ import annotations
 
+import os
+import subprocess
 import sys
 import types
 from datetime import date, datetime
@@ -33,8 +35,9 @@ def _ensure_tmp_dir() -> str:
     return "/tmp/elpis"
 dl_mod._ensure_tmp_dir = _ensure_tmp_dir
 
-def _download_histdata(symbol, date_from, date_to, tmp):
+def _download_histdata(symbol, date_from, date_to, tmp, force=False):
     _download_histdata.calls.append((symbol, date_from, date_to, tmp))
+    _download_histdata.force = force
 _download_histdata.calls = []
 dl_mod.download_histdata = _download_histdata
 
@@ -87,6 +90,15 @@ def fixed_today(monkeypatch):
     # Replace the 'date' symbol that elpis_nautilus.cli imported.
     monkeypatch.setattr(cli, "date", _FixedDate)
 
+@pytest.fixture(autouse=True)
+def histdata_cache(tmp_path, monkeypatch):
+    """Keep the instrument-list cache inside the per-test tmp dir."""
+    path = tmp_path / "histdata_info.json"
+    monkeypatch.setattr(cli, "_HISTDATA_CACHE", path)
+    cli._cached_histdata_info.cache_clear()
+    yield path
+    cli._cached_histdata_info.cache_clear()
+
 ###############################################################################
 # 3.  Unit-tests for internal helper: _histdata_info
 ###############################################################################
@@ -102,6 +114,37 @@ def test_histdata_info_parsing():
     # Interval fixed to "tick"
     assert eur.interval == "tick"
 
+def test_histdata_info_served_from_fresh_cache(monkeypatch, histdata_cache):
+    first = cli._histdata_info()
+    assert histdata_cache.exists()
+    cli._cached_histdata_info.cache_clear()   # as in a new process
+    # Second call must not scrape again
+    monkeypatch.setattr(cli, "_scrape_histdata_info",
+                        lambda: pytest.fail("cache should have been used"))
+    assert cli._histdata_info() == first
+
+def test_histdata_info_stale_cache_rescrapes(monkeypatch, histdata_cache):
+    cli._histdata_info()
+    stale = histdata_cache.stat().st_mtime - cli._HISTDATA_CACHE_TTL - 1
+    os.utime(histdata_cache, (stale, stale))
+    cli._cached_histdata_info.cache_clear()   # as in a new process
+    calls = []
+    monkeypatch.setattr(cli, "_scrape_histdata_info",
+                        lambda: calls.append(1) or [])
+    cli._histdata_info()
+    assert calls == [1]
+
+def test_histdata_info_memoised_in_process(monkeypatch):
+    first = cli._histdata_info()
+    monkeypatch.setattr(cli, "_load_histdata_cache",
+                        lambda: pytest.fail("memo should have been used"))
+    assert cli._histdata_info() == first
+
+def test_histdata_info_corrupt_cache_rescrapes(histdata_cache):
+    histdata_cache.write_text("not json")
+    infos = cli._histdata_info()
+    assert {i.symbol for i in infos} == {"EURUSD", "GBPUSD"}
+
 ###############################################################################
 # 4.  CLI command: download histdata
 ###############################################################################
@@ -124,6 +167,21 @@ def test_histdata_cmd_happy_path(monkeypatch, runner):
     ]
     assert "Done – files in /tmp/elpis" in res.output
 
+def test_histdata_cmd_force(monkeypatch, runner):
+    _download_histdata.calls.clear()
+    monkeypatch.setattr(cli.click, "confirm", lambda *_a, **_kw: True)
+    res = runner.invoke(
+        cli.cli,
+        ["download", "histdata",
+         "--symbol", "eurusd",
+         "--from", "2024-01",
+         "--to", "2024-01",
+         "--force"],
+    )
+    assert res.exit_code == 0
+    assert len(_download_histdata.calls) == 1
+    assert _download_histdata.force is True
+
 def test_histdata_cmd_user_aborts(monkeypatch, runner):
     _download_histdata.calls.clear()        # ← RESET
     monkeypatch.setattr(cli.click, "confirm", lambda *_a, **_kw: False)
@@ -162,7 +220,32 @@ def test_show_histdata_success(monkeypatch, runner):
     assert "EURUSD" in res.output
 
 def test_show_histdata_empty(monkeypatch, runner):
-    monkeypatch.setattr(cli, "_histdata_info", lambda: [])
+    monkeypatch.setattr(cli, "_histdata_info", lambda **_kw: [])
     res = runner.invoke(cli.cli, ["show-available", "histdata"])
     assert res.exit_code == 1           # SystemExit(1)
     assert "No instruments found." in res.output
+
+def test_show_histdata_refresh_bypasses_cache(monkeypatch, runner):
+    seen = []
+    def fake_info(refresh=False):
+        seen.append(refresh)
+        return []
+    monkeypatch.setattr(cli, "_histdata_info", fake_info)
+    runner.invoke(cli.cli, ["show-available", "histdata", "--refresh"])
+    assert seen == [True]
+
+
+def test_cli_help_is_lightweight():
+    """`elpis --help` must not pull in the downloader stack."""
+    code = ("import sys\n"
+            "from elpis_nautilus.cli import cli\n"
+            "try:\n"
+            "    cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "heavy = {'requests', 'lxml', 'bs4', 'tabulate'}\n"
+            "sys.exit(sorted(heavy & set(sys.modules)) or 0)")
+    res = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                         env={**os.environ,
+                              "PYTHONPATH": str(Path(cli.__file__).parents[1])})
+    assert res.returncode == 0, res.stderr
@@ -14,7 +14,8 @@ def reload_config_module(monkeypatch, env_vars=None, path_exists=True):
     keys = [
         'DATA_DIR', 'POSTGRES_HOST', 'POSTGRES_PORT', 'POSTGRES_DB',
         'POSTGRES_USER', 'POSTGRES_PASSWORD', 'ACCOUNT_KEY', 'ACCESS_TOKEN',
-        'LOG_LEVEL', 'PROMETHEUS_PORT', 'TEST_ENV_VAR'
+        'LOG_LEVEL', 'PROMETHEUS_PORT', 'DOWNLOAD_WORKERS', 'MAX_IN_FLIGHT',
+        'TEST_ENV_VAR'
     ]
     for k in keys:
         monkeypatch.delenv(k, raising=False)
@@ -53,6 +54,10 @@ def test_defaults(monkeypatch, tmp_path):
     assert cfg.data_dir_name == 'data'
     assert cfg.data_dir == config.BASE_DIR / 'data'
     assert cfg.tmp_dir == config.BASE_DIR / 'data' / 'tmp'
+    assert cfg.cache_dir == config.BASE_DIR / 'data' / 'cache'
+    # Paths are computed once per instance
+    assert cfg.data_dir is cfg.data_dir
+    assert cfg.tmp_dir is cfg.tmp_dir
 
     assert cfg.db_host == 'localhost'
     assert cfg.db_port == 5432
@@ -65,6 +70,8 @@ def test_defaults(monkeypatch, tmp_path):
 
     assert cfg.log_level == 'INFO'
     assert cfg.prometheus_port == 8000
+    assert cfg.download_workers == 4
+    assert cfg.max_in_flight == 4
 
 
 def test_env_overrides(monkeypatch):
@@ -78,7 +85,9 @@ def test_env_overrides(monkeypatch):
         'ACCOUNT_KEY': 'acct123',
         'ACCESS_TOKEN': 'token456',
         'LOG_LEVEL': 'DEBUG',
-        'PROMETHEUS_PORT': '9000'
+        'PROMETHEUS_PORT': '9000',
+        'DOWNLOAD_WORKERS': '8',
+        'MAX_IN_FLIGHT': '8'
     }
     config = reload_config_module(monkeypatch, env_vars=env_vars, path_exists=False)
     cfg = config.Config()
@@ -86,6 +95,7 @@ def test_env_overrides(monkeypatch):
     assert cfg.data_dir_name == 'customdata'
     assert cfg.data_dir == config.BASE_DIR / 'customdata'
     assert cfg.tmp_dir == config.BASE_DIR / 'customdata' / 'tmp'
+    assert cfg.cache_dir == config.BASE_DIR / 'customdata' / 'cache'
 
     assert cfg.db_host == 'db.example.com'
     assert cfg.db_port == 6543
@@ -98,6 +108,8 @@ def test_env_overrides(monkeypatch):
 
     assert cfg.log_level == 'DEBUG'
     assert cfg.prometheus_port == 9000
+    assert cfg.download_workers == 8
+    assert cfg.max_in_flight == 8
 
 
 def test_invalid_port_raises(monkeypatch):
@@ -113,6 +125,8 @@ def test_singleton_settings(monkeypatch):
     # Changing env after instantiation should not affect existing settings
     monkeypatch.setenv('LOG_LEVEL', 'WARNING')
     assert settings.log_level == 'INFO'
+    # ...while a new instance reads the environment at construction
+    assert config_module.Config().log_level == 'WARNING'
 
 
 def test_dotenv_loading(monkeypatch):
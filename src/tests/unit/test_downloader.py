@@ -1,3 +1,6 @@
+import io
+import threading
+import time
 import zipfile
 from datetime import datetime
 
@@ -63,17 +66,20 @@ def test_ensure_tmp_dir_user_accepts(tmp_path, monkeypatch):
 
 from bs4 import BeautifulSoup
 
-def make_response(text='', status=200, headers=None, raise_exception=None):
+def make_response(text='', status=200, headers=None, raise_exception=None,
+                  body=b'data'):
     class Resp:
         def __init__(self):
             self.text = text
+            self.content = text.encode()
             self.status_code = status
             self.headers = headers or {}
+            self.raw = io.BytesIO(body)
         def raise_for_status(self):
             if raise_exception:
                 raise raise_exception
-        def iter_content(self, chunk_size):
-            yield b'data'
+        def close(self):
+            pass
     return Resp()
 
 class DummySession:
@@ -105,6 +111,14 @@ def test_fetch_zip_no_form_no_link(monkeypatch, tmp_path):
     assert path is None
 
 
+def test_fetch_zip_empty_page(monkeypatch, tmp_path):
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text='', status=200)
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    assert dm._fetch_zip('SYM', 2020, 1, tmp_path) is None
+
+
 def test_fetch_zip_fallback_link_success(monkeypatch, tmp_path):
     # page with a_file link
     link_html = '<a id="a_file">file.zip</a>'
@@ -122,6 +136,80 @@ def test_fetch_zip_fallback_link_success(monkeypatch, tmp_path):
     path = dm._fetch_zip('SYM', 2020, 2, tmp_path)
     assert path.name == 'f.zip'
     assert path.exists()
+    assert not (tmp_path / 'f.zip.part').exists()
+
+
+def test_send_honours_retry_after_on_429(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(dm.time, 'sleep', sleeps.append)
+    replies = [make_response(status=429, headers={'Retry-After': '3'}),
+               make_response(status=200)]
+    resp = dm._send(lambda url, **kw: replies.pop(0), 'https://x')
+    assert resp.status_code == 200
+    assert sleeps == [3.0]
+
+
+@pytest.mark.parametrize('header', ['-1', 'nan', 'inf'])
+def test_send_ignores_unusable_retry_after(monkeypatch, header):
+    sleeps = []
+    monkeypatch.setattr(dm.time, 'sleep', sleeps.append)
+    replies = [make_response(status=429, headers={'Retry-After': header}),
+               make_response(status=200)]
+    resp = dm._send(lambda url, **kw: replies.pop(0), 'https://x')
+    assert resp.status_code == 200
+    # falls back to the jittered exponential delay for attempt 1
+    assert len(sleeps) == 1 and 2 <= sleeps[0] < 3
+
+
+def test_fetch_zip_retries_download_after_429(monkeypatch, tmp_path):
+    sleeps = []
+    monkeypatch.setattr(dm.time, 'sleep', sleeps.append)
+    replies = [make_response(status=429), make_response(status=429),
+               make_response(status=200, headers={
+                   'Content-Type': 'application/zip',
+                   'Content-Disposition': 'attachment; filename="f.zip"'})]
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text='<html><a id="a_file">f.zip</a></html>')
+        def post(self, url, **kwargs):
+            return replies.pop(0)
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    path = dm._fetch_zip('SYM', 2020, 1, tmp_path)
+    assert path == tmp_path / 'f.zip'
+    # no Retry-After, so the jittered exponential delay grows each time
+    assert len(sleeps) == 2
+    assert sleeps[0] < sleeps[1]
+
+
+def test_send_gives_up_after_max_attempts(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(dm.time, 'sleep', sleeps.append)
+    calls = []
+    def call(url, **kw):
+        calls.append(url)
+        return make_response(status=429, headers={'Retry-After': 'soon'})
+    resp = dm._send(call, 'https://x')
+    assert resp.status_code == 429
+    assert len(calls) == dm.RATE_LIMIT_ATTEMPTS
+    assert len(sleeps) == dm.RATE_LIMIT_ATTEMPTS - 1
+
+
+def test_send_bounds_requests_in_flight(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    monkeypatch.setattr(dm, '_REQUEST_SLOTS', threading.BoundedSemaphore(2))
+    lock = threading.Lock()
+    active, peak = [0], [0]
+    def call(url, **kw):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return make_response(status=200)
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda _: dm._send(call, 'https://x'), range(6)))
+    assert peak[0] <= 2
 
 
 # ==== Additional tests to increase coverage ==== 
@@ -168,29 +256,284 @@ def test_fetch_zip_form_success(monkeypatch, tmp_path):
     monkeypatch.setattr(Sess, 'post', fake_post)
     path = dm._fetch_zip('SYM', 2020, 4, tmp_path)
     assert path.name == 'f2.zip'
-    assert path.exists()
+    assert path.read_bytes() == b'data'
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_fetch_zip_streams_large_body(monkeypatch, tmp_path):
+    # several copy blocks' worth of data must land on disk intact
+    body = bytes(range(256)) * (3 * 4096 + 7)
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text='<html><a id="a_file">big.zip</a></html>')
+        def post(self, url, **kwargs):
+            return make_response(body=body, headers={
+                'Content-Type': 'application/zip',
+                'Content-Disposition': 'attachment; filename="big.zip"'})
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    path = dm._fetch_zip('SYM', 2020, 1, tmp_path)
+    assert path.read_bytes() == body
+
+
+def test_fetch_zip_stream_error_removes_part(monkeypatch, tmp_path):
+    import urllib3.exceptions
+    class BrokenRaw(io.BytesIO):
+        def read(self, *args):
+            raise urllib3.exceptions.ProtocolError('connection reset')
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text='<html><a id="a_file">f.zip</a></html>')
+        def post(self, url, **kwargs):
+            resp = make_response(headers={
+                'Content-Type': 'application/zip',
+                'Content-Disposition': 'attachment; filename="f.zip"'})
+            resp.raw = BrokenRaw()
+            return resp
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    assert dm._fetch_zip('SYM', 2020, 1, tmp_path) is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_fetch_zip_holds_request_slot_while_streaming(monkeypatch, tmp_path):
+    slots = threading.BoundedSemaphore(1)
+    monkeypatch.setattr(dm, '_REQUEST_SLOTS', slots)
+    free_during_read = []
+    class WatchedRaw(io.BytesIO):
+        def read(self, *args):
+            free = slots.acquire(blocking=False)
+            if free:
+                slots.release()
+            free_during_read.append(free)
+            return super().read(*args)
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text='<html><a id="a_file">f.zip</a></html>')
+        def post(self, url, **kwargs):
+            resp = make_response(headers={
+                'Content-Type': 'application/zip',
+                'Content-Disposition': 'attachment; filename="f.zip"'})
+            resp.raw = WatchedRaw(b'data')
+            return resp
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    assert dm._fetch_zip('SYM', 2020, 1, tmp_path) == tmp_path / 'f.zip'
+    assert free_during_read and not any(free_during_read)
+    # released again once the body is on disk
+    assert slots.acquire(blocking=False)
+
+
+def test_download_workers_fit_request_slots():
+    assert 1 <= dm.DOWNLOAD_WORKERS <= dm.MAX_IN_FLIGHT <= dm.POOL_SIZE
+
+
+@pytest.mark.parametrize('page', [
+    # XML prolog: lxml rejects this as a str, so bytes must be parsed
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<html><body><a id="a_file">f.zip</a></body></html>',
+    # fragment whose root element is the link itself
+    '<a id="a_file">f.zip</a>',
+])
+def test_fetch_zip_finds_link_in_unusual_pages(monkeypatch, tmp_path, page):
+    class Sess(DummySession):
+        def get(self, url, timeout):
+            return make_response(text=page)
+    monkeypatch.setattr(dm, '_session', lambda: Sess())
+    assert dm._fetch_zip('SYM', 2020, 1, tmp_path) == tmp_path / 'f.zip'
 
 
 def test_download_histdata_full_cycle(monkeypatch, tmp_path):
     # Simulate two months, one succeeds, one fails
     fetched = []
     extracted = []
+    lock = threading.Lock()
     def fake_fetch(symbol, y, m, dest):
-        fetched.append((y, m))
+        with lock:
+            fetched.append((y, m))
         if m == 5:
             f = tmp_path / 'x.zip'
             f.write_bytes(b'zip')
             return f
         return None
     def fake_extract(zip_path, dest):
-        extracted.append(zip_path.name)
+        with lock:
+            extracted.append(zip_path.name)
     monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
     monkeypatch.setattr(dm, '_extract_zip', fake_extract)
     dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 31), tmp_path)
-    assert fetched == [(2020, 4), (2020, 5)]
+    # months are fetched concurrently, so completion order is not fixed
+    assert set(fetched) == {(2020, 4), (2020, 5)}
     assert extracted == ['x.zip']
 
 
+def test_download_histdata_marks_completed_months(monkeypatch, tmp_path):
+    def fake_fetch(symbol, y, m, dest):
+        path = tmp_path / f'{m}.zip'
+        path.write_bytes(b'zip')
+        return path
+    # month 5 extracts fine, month 4 is a bad archive
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, '_extract_zip',
+                        lambda p, d: ['may.csv'] if p.name == '5.zip' else None)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 1), tmp_path)
+    marker = dm._month_marker(tmp_path, 'SYM', 2020, 5)
+    assert marker.read_text().split() == ['may.csv']
+    assert not dm._month_marker(tmp_path, 'SYM', 2020, 4).exists()
+
+
+def test_download_histdata_marks_month_before_run_ends(monkeypatch, tmp_path):
+    # month 5's download waits for month 4's marker; it must appear while
+    # the run is still going, not only after every download has finished
+    april = dm._month_marker(tmp_path, 'SYM', 2020, 4)
+    seen = []
+    def fake_fetch(symbol, y, m, dest):
+        if m == 5:
+            deadline = time.monotonic() + 5
+            while not april.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            seen.append(april.exists())
+            return None
+        path = tmp_path / f'{m}.zip'
+        path.write_bytes(b'zip')
+        return path
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, '_extract_zip', lambda p, d: ['april.csv'])
+    monkeypatch.setattr(dm, 'DOWNLOAD_WORKERS', 2)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 1), tmp_path)
+    assert seen == [True]
+
+
+def test_download_histdata_survives_failing_month(monkeypatch, tmp_path):
+    def fake_fetch(symbol, y, m, dest):
+        if m == 6:
+            raise OSError('disk full')
+        path = tmp_path / f'{m}.zip'
+        path.write_bytes(b'zip')
+        return path
+    def fake_extract(zip_path, dest):
+        if zip_path.name == '7.zip':
+            raise ValueError('boom')
+        zip_path.unlink()
+        return [zip_path.stem + '.csv']
+    errors = []
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, '_extract_zip', fake_extract)
+    monkeypatch.setattr(dm.logger, 'error', lambda *a, **kw: errors.append(a))
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 8, 1), tmp_path)
+    marked = {m for m in range(4, 9)
+              if dm._month_marker(tmp_path, 'SYM', 2020, m).exists()}
+    assert marked == {4, 5, 8}
+    assert len(errors) == 2
+
+
+def test_download_histdata_interrupt_cancels_queued_months(monkeypatch, tmp_path):
+    fetched = []
+    def fake_fetch(symbol, y, m, dest):
+        fetched.append((y, m))
+        time.sleep(0.05)
+        return None
+    def interrupted(fs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, 'as_completed', interrupted)
+    monkeypatch.setattr(dm, 'DOWNLOAD_WORKERS', 1)
+    with pytest.raises(KeyboardInterrupt):
+        dm.download_histdata('SYM', datetime(2010, 1, 1), datetime(2019, 12, 1),
+                             tmp_path)
+    # at most the month already running finishes; the other 119 are dropped
+    assert len(fetched) <= 1
+
+
+def test_download_histdata_skips_completed_months(monkeypatch, tmp_path):
+    (tmp_path / 'april.csv').write_text('1,2,3')
+    dm._month_marker(tmp_path, 'SYM', 2020, 4).write_text('april.csv')
+    fetched = []
+    def fake_fetch(symbol, y, m, dest):
+        fetched.append((y, m))
+        return None
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 1), tmp_path)
+    assert fetched == [(2020, 5)]
+
+
+def test_download_histdata_force_ignores_markers(monkeypatch, tmp_path):
+    (tmp_path / 'april.csv').write_text('1,2,3')
+    marker = dm._month_marker(tmp_path, 'SYM', 2020, 4)
+    marker.write_text('april.csv')
+    fetched = []
+    def fake_fetch(symbol, y, m, dest):
+        fetched.append((y, m))
+        return None
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 4, 1),
+                         tmp_path, force=True)
+    assert fetched == [(2020, 4)]
+    # failed re-download leaves the month unmarked
+    assert not marker.exists()
+
+
+def test_download_histdata_removes_stray_part_files(monkeypatch, tmp_path):
+    stray = tmp_path / 'HISTDATA_COM_ASCII_SYM_T202003.zip.part'
+    stray.write_bytes(b'trunc')
+    # another symbol's download in progress in the same directory
+    other = tmp_path / 'HISTDATA_COM_ASCII_EURUSD_T202003.zip.part'
+    other.write_bytes(b'partial')
+    monkeypatch.setattr(dm, '_fetch_zip', lambda *a: None)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 4, 1), tmp_path)
+    assert not stray.exists()
+    assert other.exists()
+
+
+def test_download_histdata_refetches_month_with_missing_files(monkeypatch, tmp_path):
+    # marker present but its CSV was deleted since the last run
+    dm._month_marker(tmp_path, 'SYM', 2020, 4).write_text('april.csv')
+    fetched = []
+    def fake_fetch(symbol, y, m, dest):
+        fetched.append((y, m))
+        return None
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 4, 1), tmp_path)
+    assert fetched == [(2020, 4)]
+
+
+def test_html_parser_reused_per_thread():
+    main = dm._html_parser()
+    assert dm._html_parser() is main
+    other = []
+    t = threading.Thread(target=lambda: other.append(dm._html_parser()))
+    t.start(); t.join()
+    assert other[0] is not main
+
+
+def test_download_histdata_fetches_months_concurrently(monkeypatch, tmp_path):
+    # Both fetches must be in flight at the same time to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    def fake_fetch(symbol, y, m, dest):
+        barrier.wait()
+        return None
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, 'DOWNLOAD_WORKERS', 2)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 1), tmp_path)
+
+
+def test_download_histdata_extracts_while_downloading(monkeypatch, tmp_path):
+    # Month 5 finishes first; month 4's download only completes once
+    # month 5 has been extracted, so extraction must not wait for month 4.
+    extracted_may = threading.Event()
+    def fake_fetch(symbol, y, m, dest):
+        if m == 4:
+            assert extracted_may.wait(timeout=5)
+        path = tmp_path / f'{m}.zip'
+        path.write_bytes(b'zip')
+        return path
+    def fake_extract(zip_path, dest):
+        if zip_path.name == '5.zip':
+            extracted_may.set()
+    monkeypatch.setattr(dm, '_fetch_zip', fake_fetch)
+    monkeypatch.setattr(dm, '_extract_zip', fake_extract)
+    monkeypatch.setattr(dm, 'DOWNLOAD_WORKERS', 2)
+    dm.download_histdata('SYM', datetime(2020, 4, 1), datetime(2020, 5, 1), tmp_path)
+    assert extracted_may.is_set()
+
+
 # ==== Tests for basic helpers ==== 
 
 def test_year_month_range_single_month():
@@ -205,6 +548,18 @@ def test_year_month_range_multiple_months():
     assert list(dm._year_month_range(start, end)) == [(2021, 12), (2022, 1)]
 
 
+def test_year_month_range_end_before_start_is_empty():
+    start = datetime(2022, 3, 1)
+    end = datetime(2022, 2, 28)
+    assert list(dm._year_month_range(start, end)) == []
+
+
+def test_year_month_range_spans_full_year():
+    months = list(dm._year_month_range(datetime(2019, 1, 1), datetime(2020, 1, 1)))
+    assert len(months) == 13
+    assert months[0] == (2019, 1) and months[-1] == (2020, 1)
+
+
 def test_histdata_page_url():
     url = dm._histdata_page('TestSym', 1999, 11)
     assert url.startswith(dm.HISTDATA_BASE)
@@ -216,8 +571,11 @@ def test_session_singleton_and_headers(monkeypatch):
     class DummySess:
         def __init__(self):
             self.headers = {}
+            self.adapters = {}
         def headers_update(self, d):
             self.headers.update(d)
+        def mount(self, prefix, adapter):
+            self.adapters[prefix] = adapter
     monkeypatch.setattr(requests, 'Session', DummySess)
     # reset SESSION
     dm._SESSION = None
@@ -226,12 +584,94 @@ def test_session_singleton_and_headers(monkeypatch):
     assert s1 is s2
     for k in dm.HEADERS:
         assert k in s1.headers
+    assert set(s1.adapters) == {'https://', 'http://'}
+
+
+def test_session_created_once_under_concurrency(monkeypatch):
+    created = []
+    class SlowSess:
+        def __init__(self):
+            created.append(self)
+            time.sleep(0.01)   # widen the check-then-create window
+            self.headers = {}
+        def mount(self, prefix, adapter):
+            pass
+    monkeypatch.setattr(requests, 'Session', SlowSess)
+    monkeypatch.setattr(dm, '_SESSION', None)
+    barrier = threading.Barrier(8)
+    seen = []
+    def worker():
+        barrier.wait()
+        seen.append(dm._session())
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(created) == 1
+    assert all(s is created[0] for s in seen)
+    # the default headers were copied into that one session
+    assert created[0].headers == dict(dm.HEADERS)
+
+
+def test_session_adapter_pool_and_retries(monkeypatch):
+    monkeypatch.setattr(dm, '_SESSION', None)
+    adapter = dm._session().get_adapter('https://www.histdata.com/')
+    assert adapter.poolmanager.connection_pool_kw['maxsize'] == dm.POOL_SIZE
+    assert adapter.max_retries is dm.RETRY_POLICY
+    # 429 is handled by _send so it can back off with jitter
+    assert 429 not in adapter.max_retries.status_forcelist
+    assert 503 in adapter.max_retries.status_forcelist
+    assert 'POST' in adapter.max_retries.allowed_methods
+
+
+def test_session_reuses_connection(monkeypatch):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    peers = []
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        def do_GET(self):
+            peers.append(self.client_address)
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'ok')
+        def log_message(self, *args):
+            pass
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(dm, '_SESSION', None)
+    sess = dm._session()
+    try:
+        url = f'http://127.0.0.1:{server.server_port}/'
+        assert sess.get(url, timeout=5).text == 'ok'
+        assert sess.get(url, timeout=5).text == 'ok'
+    finally:
+        sess.close()
+        server.shutdown()
+        server.server_close()
+    # both requests arrived over the same keep-alive socket
+    assert len(peers) == 2 and peers[0] == peers[1]
 
 
 def test_extract_filename_quotes_and_plain():
     assert dm._extract_filename('attachment; filename="abc.zip"') == 'abc.zip'
     assert dm._extract_filename('attachment; filename=xyz.zip') == 'xyz.zip'
 
+@pytest.mark.parametrize('disp', [
+    'attachment; filename="HISTDATA_COM_ASCII_EURUSD_T202001.zip"',
+    'attachment; filename=HISTDATA_COM_ASCII_EURUSD_T202001.zip',
+    'attachment; filename="a b.zip"; size=10',
+    'attachment;filename=c.zip',
+    'inline; filename=d.zip; charset=utf-8',
+])
+def test_extract_filename_matches_email_parser(disp):
+    from email.message import Message
+    msg = Message()
+    msg['Content-Disposition'] = disp
+    assert dm._extract_filename(disp) == msg.get_filename()
+
+
 # ==== Tests for extract_zip (cleanup and error) ==== 
 
 def test_extract_zip_success_and_txt_removal(tmp_path):
@@ -243,7 +683,7 @@ def test_extract_zip_success_and_txt_removal(tmp_path):
         zf.writestr('f.csv', '1,2,3')
         zf.writestr('f.txt', 'hello')
     # Call extract
-    dm._extract_zip(z, out)
+    assert dm._extract_zip(z, out) == ['f.csv']
     assert not z.exists()
     assert (out / 'f.csv').exists()
     assert not (out / 'f.txt').exists()
@@ -255,34 +695,26 @@ def test_extract_zip_bad_zip_removes_file(monkeypatch, tmp_path):
     z.write_bytes(b'bad')
     out = tmp_path / 'out'
     out.mkdir()
-    # Should not raise and should remove z
-    dm._extract_zip(z, out)
+    # Should not raise, should report failure and should remove z
+    assert dm._extract_zip(z, out) is None
     assert not z.exists()
 
 
-def test_extract_zip_txt_unlink_warning(monkeypatch, tmp_path):
-    # Create a zip with txt
+def test_extract_zip_skips_txt_member(monkeypatch, tmp_path):
     z = tmp_path / 't.zip'
     out = tmp_path / 'out'
     out.mkdir()
     with zipfile.ZipFile(z, 'w') as zf:
-        zf.writestr('a.txt', 'data')
-    # Monkeypatch unlink to raise for .txt
-    import pathlib as _pl
-    orig_unlink = _pl.Path.unlink
-    def fake_unlink(self, *args, **kwargs):
-        if self.suffix == '.txt':
-            raise OSError('cannot delete')
-        return orig_unlink(self, *args, **kwargs)
-    monkeypatch.setattr(_pl.Path, 'unlink', fake_unlink)
-    # Capture warning
-    warnings = []
-    monkeypatch.setattr(dm.logger, 'warning', lambda *args, **kwargs: warnings.append(args))
-    dm._extract_zip(z, out)
-    # zip removed, txt still present
+        zf.writestr('a.csv', '1,2,3')
+        zf.writestr('a.txt', 'status')
+    orig_unlink = dm.os.unlink
+    def guarded_unlink(path, *args, **kwargs):
+        assert not str(path).endswith('.txt'), 'txt member was written'
+        return orig_unlink(path, *args, **kwargs)
+    monkeypatch.setattr(dm.os, 'unlink', guarded_unlink)
+    assert dm._extract_zip(z, out) == ['a.csv']
+    assert sorted(p.name for p in out.iterdir()) == ['a.csv']
     assert not z.exists()
-    assert (out / 'a.txt').exists()
-    assert warnings, 'Expected a warning for txt unlink'
 
 # ==== Tests for constants and logger ====  
 import logging
@@ -290,6 +722,8 @@ import logging
 def test_headers_constant():
     assert 'User-Agent' in dm.HEADERS
     assert 'Accept' in dm.HEADERS
+    with pytest.raises(TypeError):
+        dm.HEADERS['Accept'] = '*/*'
 
 
 def test_histdata_base_constant():